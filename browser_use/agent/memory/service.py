@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
-from typing import List, Optional
+import zlib
+from collections import OrderedDict
+from typing import Iterable, List, Optional
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import (
@@ -13,10 +17,32 @@ from langchain_core.messages.utils import convert_to_openai_messages
 from browser_use.agent.memory.views import MemoryConfig
 from browser_use.agent.message_manager.service import MessageManager
 from browser_use.agent.message_manager.views import ManagedMessage, MessageMetadata
-from browser_use.utils import time_execution_sync
+from browser_use.utils import time_execution_async, time_execution_sync
 
 logger = logging.getLogger(__name__)
 
+# Message types that are kept out of procedural memory consolidation, hoisted to
+# module scope so the set is not rebuilt on every iteration of the history loop
+_MEMORY_MESSAGE_TYPES: frozenset[str] = frozenset({'init', 'memory'})
+
+# Minimum number of new history tokens since the last consolidation before another
+# Mem0/LLM round-trip is worth making (e.g. the agent stalled waiting on a page)
+_MIN_NEW_TOKENS_TO_CONSOLIDATE = 500
+
+# Maximum number of summaries kept in the exact-match cache in front of Mem0
+_SUMMARY_CACHE_SIZE = 64
+
+# Static system prompt for procedural memory creation. Kept free of per-call values
+# (step numbers etc.) so LLM providers can reuse their prompt-prefix cache across
+# summarization calls; dynamic details travel in the messages and metadata instead.
+PROCEDURAL_MEMORY_PROMPT = """You are reviewing the recent interaction history of a browser automation agent.
+Condense it into a single procedural memory that preserves everything needed to continue the task:
+1. The overall task and the progress made towards it so far.
+2. Key findings: extracted content, URLs visited and important page state.
+3. Actions taken and their outcomes, including errors and how they were resolved.
+4. What remains to be done and any constraints discovered along the way.
+Keep the summary concise and factual. Do not invent information that is not present in the history."""
+
 
 class Memory:
 	"""
@@ -78,6 +104,17 @@ class Memory:
 		# Initialize Mem0 with the configuration
 		self.mem0 = Mem0Memory.from_config(config_dict=self.config.full_config_dict)
 
+		# Baseline for detecting whether enough new content has accumulated to consolidate
+		self._tokens_at_last_consolidation = self.message_manager.state.history.current_tokens
+
+		# Exact-match LRU cache of content hash -> summary, so identical histories
+		# (e.g. repeated runs over the same pages) skip the Mem0/LLM round-trip
+		self._summary_cache: OrderedDict[bytes, str] = OrderedDict()
+
+		# Compressed copies of the raw content replaced by each consolidation, one blob
+		# per consolidation, so full history stays retrievable without plaintext in RAM
+		self._archived_history: List[bytes] = []
+
 	@time_execution_sync('--create_procedural_memory')
 	def create_procedural_memory(self, current_step: int) -> None:
 		"""
@@ -86,63 +123,215 @@ class Memory:
 		Args:
 		    current_step: The current step number of the agent
 		"""
-		logger.info(f'Creating procedural memory at step {current_step}')
+		logger.info('Creating procedural memory at step %d', current_step)
+
+		if not self._has_new_content():
+			return
+
+		new_messages, messages_to_process, removed_tokens = self._split_history()
+
+		# Need at least 2 messages to create a meaningful summary
+		if len(messages_to_process) <= 1:
+			logger.info('Not enough non-memory messages to summarize')
+			return
+		# Create a procedural memory
+		llm_input = self._within_input_budget(self._deduplicate(messages_to_process))
+		memory_content = self._create((m.message for m in llm_input), current_step)
+
+		self._replace_with_memory(new_messages, messages_to_process, removed_tokens, memory_content)
+
+	@time_execution_async('--acreate_procedural_memory')
+	async def acreate_procedural_memory(self, current_step: int) -> None:
+		"""
+		Async variant of create_procedural_memory.
+
+		Runs the blocking Mem0/LLM call in a worker thread so the agent's event loop
+		stays responsive while the summary is generated.
+
+		Args:
+		    current_step: The current step number of the agent
+		"""
+		logger.info('Creating procedural memory at step %d', current_step)
+
+		if not self._has_new_content():
+			return
+
+		new_messages, messages_to_process, removed_tokens = self._split_history()
+
+		# Need at least 2 messages to create a meaningful summary
+		if len(messages_to_process) <= 1:
+			logger.info('Not enough non-memory messages to summarize')
+			return
+		# Create a procedural memory without blocking the event loop
+		llm_input = self._within_input_budget(self._deduplicate(messages_to_process))
+		memory_content = await asyncio.to_thread(self._create, (m.message for m in llm_input), current_step)
+
+		self._replace_with_memory(new_messages, messages_to_process, removed_tokens, memory_content)
+
+	@staticmethod
+	async def abatch_create_procedural_memory(memories: List[Memory], current_step: int) -> None:
+		"""
+		Create procedural memories for several agents concurrently.
+
+		Useful for evaluation sweeps that run many agents side by side: the blocking
+		Mem0/LLM calls are fired at the same time instead of one after another, so a
+		self-hosted backend can batch them and hosted APIs at least pipeline the requests.
+
+		Args:
+		    memories: The Memory instances of the agents needing consolidation
+		    current_step: The current step number shared by the agents
+		"""
+		await asyncio.gather(*(memory.acreate_procedural_memory(current_step) for memory in memories))
+
+	def _deduplicate(self, messages_to_process: List[ManagedMessage]) -> List[ManagedMessage]:
+		"""Drop messages with repeated content before they are sent to the LLM.
+
+		Browser trajectories often contain near-identical observations (repeated DOM
+		dumps, retried actions); feeding every copy into the consolidation wastes input
+		tokens. Only the LLM input is filtered - duplicates are still replaced in the
+		history by the consolidated memory.
+		"""
+		seen = set()
+		deduplicated = []
+
+		for msg in messages_to_process:
+			content_hash = hashlib.blake2b(str(msg.message.content).encode(), digest_size=16).digest()
+			if content_hash in seen:
+				continue
+			seen.add(content_hash)
+			deduplicated.append(msg)
+
+		if len(deduplicated) < len(messages_to_process):
+			logger.debug('Dropped %d duplicate messages before consolidation', len(messages_to_process) - len(deduplicated))
+		return deduplicated
+
+	def _within_input_budget(self, messages_to_process: List[ManagedMessage]) -> List[ManagedMessage]:
+		"""Trim the oldest raw messages until the configured input token budget is met.
+
+		Only affects what is sent to the LLM: trimmed messages are still replaced by the
+		consolidated memory, so the worst-case cost and latency of a consolidation stay
+		bounded. Previous rolling summaries are always kept since they carry the compact
+		record of everything consolidated before.
+		"""
+		budget = self.config.memory_max_input_tokens
+		if budget is None:
+			return messages_to_process
+
+		total_tokens = sum(m.metadata.tokens for m in messages_to_process)
+		if total_tokens <= budget:
+			return messages_to_process
 
-		# Get all messages
-		all_messages = self.message_manager.state.history.messages
+		trimmed = []
+		for msg in messages_to_process:
+			if total_tokens > budget and msg.metadata.message_type != 'memory':
+				total_tokens -= msg.metadata.tokens
+				continue
+			trimmed.append(msg)
 
-		# Separate messages into those to keep as-is and those to process for memory
+		logger.info(
+			'Trimmed %d oldest messages to fit the memory input budget of %d tokens',
+			len(messages_to_process) - len(trimmed),
+			budget,
+		)
+		return trimmed
+
+	def _has_new_content(self) -> bool:
+		"""Check whether enough new history has accumulated since the last consolidation"""
+		new_tokens = self.message_manager.state.history.current_tokens - self._tokens_at_last_consolidation
+		if new_tokens < _MIN_NEW_TOKENS_TO_CONSOLIDATE:
+			logger.info('Not enough new content since the last consolidation, skipping procedural memory')
+			return False
+		return True
+
+	def _split_history(self) -> tuple[List[ManagedMessage], List[ManagedMessage], int]:
+		"""Separate history messages into those to keep as-is and those to process for memory.
+
+		Earlier procedural memories are folded into the messages to process, so each
+		consolidation produces a single rolling summary (previous summary + new messages)
+		instead of accumulating one memory message per interval. The token count of the
+		messages to process is accumulated in the same pass, so long histories are only
+		traversed once.
+		"""
 		new_messages = []
 		messages_to_process = []
+		removed_tokens = 0
 
-		for msg in all_messages:
-			if isinstance(msg, ManagedMessage) and msg.metadata.message_type in {'init', 'memory'}:
-				# Keep system and memory messages as they are
-				new_messages.append(msg)
+		for msg in self.message_manager.state.history.messages:
+			if isinstance(msg, ManagedMessage) and msg.metadata.message_type in _MEMORY_MESSAGE_TYPES:
+				if msg.metadata.message_type == 'memory':
+					# Fold the previous rolling summary into the new consolidation
+					messages_to_process.append(msg)
+					removed_tokens += msg.metadata.tokens
+				else:
+					# Keep system and other init messages as they are
+					new_messages.append(msg)
 			else:
 				if len(msg.message.content) > 0:
 					messages_to_process.append(msg)
+					removed_tokens += msg.metadata.tokens
 
-		# Need at least 2 messages to create a meaningful summary
-		if len(messages_to_process) <= 1:
-			logger.info('Not enough non-memory messages to summarize')
-			return
-		# Create a procedural memory
-		memory_content = self._create([m.message for m in messages_to_process], current_step)
+		return new_messages, messages_to_process, removed_tokens
 
+	def _replace_with_memory(
+		self,
+		new_messages: List[ManagedMessage],
+		messages_to_process: List[ManagedMessage],
+		removed_tokens: int,
+		memory_content: Optional[str],
+	) -> None:
+		"""Replace the processed messages in the history with the consolidated memory"""
 		if not memory_content:
 			logger.warning('Failed to create procedural memory')
 			return
 
-		# Replace the processed messages with the consolidated memory
+		# Archive the raw content being consolidated before it is dropped from the history
+		raw_text = '\n'.join(str(m.message.content) for m in messages_to_process)
+		self._archived_history.append(zlib.compress(raw_text.encode(), level=3))
+
 		memory_message = HumanMessage(content=memory_content)
 		memory_tokens = self.message_manager._count_tokens(memory_message)
 		memory_metadata = MessageMetadata(tokens=memory_tokens, message_type='memory')
 
-		# Calculate the total tokens being removed
-		removed_tokens = sum(m.metadata.tokens for m in messages_to_process)
-
 		# Add the memory message
 		new_messages.append(ManagedMessage(message=memory_message, metadata=memory_metadata))
 
 		# Update the history
-		self.message_manager.state.history.messages = new_messages
-		self.message_manager.state.history.current_tokens -= removed_tokens
-		self.message_manager.state.history.current_tokens += memory_tokens
-		logger.info(f'Messages consolidated: {len(messages_to_process)} messages converted to procedural memory')
+		history = self.message_manager.state.history
+		history.messages = new_messages
+		history.current_tokens += memory_tokens - removed_tokens
+		self._tokens_at_last_consolidation = history.current_tokens
+		logger.info('Messages consolidated: %d messages converted to procedural memory', len(messages_to_process))
+
+	def get_archived_history(self) -> List[str]:
+		"""Return the decompressed raw content replaced by past consolidations, for debugging"""
+		return [zlib.decompress(blob).decode() for blob in self._archived_history]
 
-	def _create(self, messages: List[BaseMessage], current_step: int) -> Optional[str]:
+	def _create(self, messages: Iterable[BaseMessage], current_step: int) -> Optional[str]:
 		parsed_messages = convert_to_openai_messages(messages)
+
+		cache_key = hashlib.blake2b(repr(parsed_messages).encode(), digest_size=16).digest()
+		cached_summary = self._summary_cache.get(cache_key)
+		if cached_summary is not None:
+			self._summary_cache.move_to_end(cache_key)
+			logger.debug('Procedural memory cache hit, skipping LLM call')
+			return cached_summary
+
 		try:
 			results = self.mem0.add(
 				messages=parsed_messages,
 				agent_id=self.config.agent_id,
 				memory_type='procedural_memory',
 				metadata={'step': current_step},
+				prompt=PROCEDURAL_MEMORY_PROMPT,
 			)
 			if len(results.get('results', [])):
-				return results.get('results', [])[0].get('memory')
+				memory = results.get('results', [])[0].get('memory')
+				if memory:
+					self._summary_cache[cache_key] = memory
+					if len(self._summary_cache) > _SUMMARY_CACHE_SIZE:
+						self._summary_cache.popitem(last=False)
+				return memory
 			return None
 		except Exception as e:
-			logger.error(f'Error creating procedural memory: {e}')
+			logger.error('Error creating procedural memory: %s', e)
 			return None
@@ -14,6 +14,8 @@ class MemoryConfig(BaseModel):
 	# Memory settings
 	agent_id: str = Field(default='browser_use_agent', min_length=1)
 	memory_interval: int = Field(default=10, gt=1, lt=100)
+	# Optional cap on the tokens sent to the LLM per consolidation; None disables the guardrail
+	memory_max_input_tokens: int | None = Field(default=None, gt=0)
 
 	# Embedder settings
 	embedder_provider: Literal['openai', 'gemini', 'ollama', 'huggingface'] = 'huggingface'
@@ -36,12 +36,14 @@ class MessageManager:
 		self,
 		task: str,
 		system_message: SystemMessage,
-		settings: MessageManagerSettings = MessageManagerSettings(),
-		state: MessageManagerState = MessageManagerState(),
+		settings: MessageManagerSettings | None = None,
+		state: MessageManagerState | None = None,
 	):
 		self.task = task
-		self.settings = settings
-		self.state = state
+		# Build fresh defaults per instance - default argument instances are created once
+		# at definition time and would be shared (and mutated) across all managers
+		self.settings = settings if settings is not None else MessageManagerSettings()
+		self.state = state if state is not None else MessageManagerState()
 		self.system_prompt = system_message
 
 		# Only initialize messages if state is empty
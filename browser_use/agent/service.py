@@ -202,6 +202,10 @@ class Agent(Generic[Context]):
 		self._set_model_names()
 		self.tool_calling_method = self._set_tool_calling_method()
 
+		# Cached planner system message - the planner prompt text is identical for every
+		# planning step, so it is built once on first use (see _run_planner)
+		self._planner_system_message: SystemMessage | HumanMessage | None = None
+
 		# Handle users trying to use use_vision=True with DeepSeek models
 		if 'deepseek' in self.model_name.lower():
 			logger.warning('⚠️ DeepSeek models do not support use_vision=True yet. Setting use_vision=False for now...')
@@ -417,7 +421,7 @@ class Agent(Generic[Context]):
 
 			# generate procedural memory if needed
 			if self.enable_memory and self.memory and self.state.n_steps % self.memory.config.memory_interval == 0:
-				self.memory.create_procedural_memory(self.state.n_steps)
+				await self.memory.acreate_procedural_memory(self.state.n_steps)
 
 			await self._raise_if_stopped_or_paused()
 
@@ -1231,7 +1235,8 @@ class Agent(Generic[Context]):
 		try:
 			# dont convert this to async! it *should* block any subsequent llm calls from running
 			response = self.llm.invoke([HumanMessage(content=test_prompt)])  # noqa: ASYNC
-			response_text = str(response.content).lower()
+			content = response.content
+			response_text = (content if isinstance(content, str) else str(content)).lower()
 
 			if test_answer in response_text:
 				logger.debug(
@@ -1263,21 +1268,28 @@ class Agent(Generic[Context]):
 		# Get current state to filter actions by page
 		page = await self.browser_context.get_current_page()
 
-		# Get all standard actions (no filter) and page-specific actions
-		standard_actions = self.controller.registry.get_prompt_description()  # No page = system prompt actions
-		page_actions = self.controller.registry.get_prompt_description(page)  # Page-specific actions
-
-		# Combine both for the planner
-		all_actions = standard_actions
-		if page_actions:
-			all_actions += '\n' + page_actions
+		if self._planner_system_message is None or self.settings.is_planner_reasoning:
+			# Get all standard actions (no filter) and page-specific actions
+			standard_actions = self.controller.registry.get_prompt_description()  # No page = system prompt actions
+			page_actions = self.controller.registry.get_prompt_description(page)  # Page-specific actions
+
+			# Combine both for the planner
+			all_actions = standard_actions
+			if page_actions:
+				all_actions += '\n' + page_actions
+
+			# The prompt text does not change between planning steps, so reuse the built
+			# message instead of re-assembling the action descriptions and re-validating a
+			# new SystemMessage every run. The is_planner_reasoning variant is a HumanMessage
+			# that downstream message merging may mutate, so it is still rebuilt per call.
+			self._planner_system_message = PlannerPrompt(all_actions).get_system_message(
+				is_planner_reasoning=self.settings.is_planner_reasoning,
+				extended_planner_system_prompt=self.settings.extend_planner_system_message,
+			)
 
 		# Create planner message history using full message history with all available actions
 		planner_messages = [
-			PlannerPrompt(all_actions).get_system_message(
-				is_planner_reasoning=self.settings.is_planner_reasoning,
-				extended_planner_system_prompt=self.settings.extend_planner_system_message,
-			),
+			self._planner_system_message,
 			*self._message_manager.get_messages()[1:],  # Use full message history except the first
 		]
 
@@ -1305,7 +1317,8 @@ class Agent(Generic[Context]):
 			logger.error(f'Failed to invoke planner: {str(e)}')
 			raise LLMException(401, 'LLM API call failed') from e
 
-		plan = str(response.content)
+		content = response.content
+		plan = content if isinstance(content, str) else str(content)
 		# if deepseek-reasoner, remove think tags
 		if self.planner_model_name and (
 			'deepseek-r1' in self.planner_model_name or 'deepseek-reasoner' in self.planner_model_name